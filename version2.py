@@ -4,12 +4,270 @@ from PySide6.QtWidgets import (
     QDialog, QFormLayout, QPlainTextEdit, QDateEdit,QGroupBox
 )
 from PySide6.QtGui import Qt, QIcon,QMouseEvent, QPixmap
-from PySide6.QtCore import QDate,QSize
+from PySide6.QtCore import QDate,QSize, QObject, QRunnable, QThreadPool, QTimer, Signal
 import webbrowser
 import sys
-from lxml import etree
+import os
+import hashlib
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache, partial
+from collections import deque
 import json
-import pandas as pd
+import logging
+try:
+    import orjson  # Optional: much faster section-data JSON; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Shape types that route flow to a downstream RCHRES in the NETWORK block
+ROUTING_HYDRO_TYPES = frozenset({"RCHRES", "Node", "SWM Facility"})
+
+# NETWORK block line templates; labels are passed already padded to 3 columns and
+# drainage areas already divided by the scale (see build_drainage_area_mapping)
+DRAINAGE_AREA_SCALE = 100000
+PERLND_NETWORK_FMT = "PERLND {} PWATER PERO      {:<9.7f}      RCHRES {}     INFLOW"
+IMPLND_NETWORK_FMT = "IMPLND {} IWATER SURO      {:<9.7f}      RCHRES {}     INFLOW"
+RCHRES_NETWORK_FMT = "RCHRES {} HYDR   ROVOL                    RCHRES {}     INFLOW"
+
+# Columns read from the drainage-area Excel sheet
+DRAINAGE_COLUMN_DTYPES = {"SUBCATCHMENT": "int64", "PERLND": "float64", "IMPLND": "float64"}
+
+# On-disk cache of parsed Draw.io diagrams (keyed by path, mtime, size and version)
+DRAWIO_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hspf_uci", "drawio")
+DRAWIO_CACHE_MAX_ENTRIES = 32
+# Bump whenever parse_diagram's output or the Shape/Connection layout changes
+DRAWIO_CACHE_VERSION = 2
+
+# -------------------------------------------------------
+# Section field definitions
+# -------------------------------------------------------
+# GLOBAL section: field name -> placeholder, help text, manual page and validation flags
+GLOBAL_SECTION_FIELDS = {
+    "Model Name": {
+        "placeholder": "Enter a descriptive name for the watershed/model run",
+        "help_text": "This appears under GLOBAL in the UCI.",
+        "pdf_page": 28,
+        "required": True
+    },
+    "Start Date (YYYY/MM/DD)": {
+        "placeholder": "YYYY/MM/DD",
+        "help_text": "Simulation start date.",
+        "pdf_page": 29,
+        "required": True,
+        "is_date": True
+    },
+    "End Date (YYYY/MM/DD)": {
+        "placeholder": "YYYY/MM/DD",
+        "help_text": "Simulation end date.",
+        "pdf_page": 29,
+        "required": True,
+        "is_date": True
+    },
+    "Run/Interp/Output Level": {
+        "placeholder": "RUN INTERP OUTPUT LEVEL    3",
+        "help_text": "Specifies how HSPF will run.",
+        "pdf_page": 30,
+        "required": True
+    },
+    "Resume": {
+        "placeholder": "e.g., 0",
+        "help_text": "'RESUME 0' means do not resume a previous run.",
+        "pdf_page": 30,
+        "required": True
+    },
+    "Run": {
+        "placeholder": "e.g., 1",
+        "help_text": "Sets a run number, e.g. 'RUN 1'.",
+        "pdf_page": 30,
+        "required": True
+    },
+    "Unit System": {
+        "placeholder": "1=English, 2=Metric",
+        "help_text": "Defines unit system: 1=English, 2=Metric.",
+        "pdf_page": 31,
+        "required": True
+    }
+}
+
+# FILES section: WDM and HSPF output file names
+FILES_SECTION_FIELDS = {
+    "WDM1 (Input File Name)": {
+        "placeholder": "e.g., CONMET.WDM",
+        "help_text": "The primary input file for data.",
+        "pdf_page": 52,
+        "required": True,
+    },
+    "WDM2 (Output File Name)": {
+        "placeholder": "e.g., CONOUT.WDM",
+        "help_text": "The primary output file for data.",
+        "pdf_page": 52,
+        "required": True,
+    },
+    "INFO (Output File Name)": {
+        "placeholder": "e.g., 01_HSPINF.DA",
+        "help_text": "The file for general information output.",
+        "pdf_page": 53,
+        "required": True,
+    },
+    "ERROR (Output File Name)": {
+        "placeholder": "e.g., 01_HSPERR.DA",
+        "help_text": "The file for error message logs.",
+        "pdf_page": 53,
+        "required": True,
+    },
+    "WARN (Output File Name)": {
+        "placeholder": "e.g., 01_HSPWRN.DA",
+        "help_text": "The file for warning message logs.",
+        "pdf_page": 53,
+        "required": True,
+    },
+    "MESSU (Output File Name)": {
+        "placeholder": "e.g., 01_HSPMES.DA",
+        "help_text": "The file for user message logs.",
+        "pdf_page": 53,
+        "required": True,
+    },
+    "Optional Output File": {
+        "placeholder": "e.g., 01_EXTL1.OUT",
+        "help_text": "Any additional output file (optional).",
+        "pdf_page": 53,
+        "required": False,
+    },
+}
+
+# Single free-text field shown for sections that don't have a detailed form yet
+SIMPLE_SECTION_FIELDS = {
+    "PERLND": {"Pervious Land Parameters": "Specify parameters for pervious land areas"},
+    "IMPLND": {"Impervious Land Parameters": "Specify parameters for impervious land areas"},
+    "RCHRES": {"Routing Parameters": "Specify parameters for reaches and reservoirs"},
+    "FTABLES": {"FTable Parameters": "Specify flow tables for routing"},
+    "EXT SOURCES": {"External Source Parameters": "Define external input sources"},
+    "EXT TARGETS": {"External Target Parameters": "Specify targets for external inputs"},
+}
+
+# Section buttons in display order: (name, help text, callback method, manual page)
+SECTION_BUTTONS = (
+    ("GLOBAL",
+     "Specifies the global simulation parameters, including model name, time step, simulation start/end dates, and unit system.",
+     "global_section", 28),
+    ("FILES",
+     "Defines the input and output file configurations, including WDM files, error logs, and message logs used by the simulation.",
+     "files_section", 52),
+    ("OPN SEQUENCE",
+     "Specifies the sequence of operations for hydrologic and hydraulic processes, such as subcatchments, reaches, and reservoirs.",
+     "opn_sequence_section", 53),
+    ("PERLND",
+     "Defines parameters for pervious land areas, including surface runoff, infiltration, and interflow processes.",
+     "perlnd_section", 66),
+    ("IMPLND",
+     "Specifies parameters for impervious land areas, focusing on surface runoff processes and water balance calculations.",
+     "implnd_section", 68),
+    ("RCHRES",
+     "Manages routing and storage for reaches and reservoirs, including flow routing, sediment transport, and water quality simulations.",
+     "rchres_section", 70),
+    ("FTABLES",
+     "Defines flow tables (FTABLEs) for routing water through channels and reservoirs, specifying stage-discharge relationships.",
+     "ftables_section", 72),
+    ("EXT SOURCES",
+     "Specifies external sources of input, including precipitation, point source flows, and other inflows to the hydrologic system.",
+     "ext_sources_section", 74),
+    ("EXT TARGETS",
+     "Defines output targets for external inputs, such as monitoring locations or downstream flow points.",
+     "ext_targets_section", 76),
+    ("NETWORK",
+     "Specifies flow relationships between elements like pervious land, impervious land, reaches, and reservoirs.",
+     "network_section", 78),
+)
+
+# File pickers skip per-folder custom icon lookups (slow on large or network folders)
+FILE_DIALOG_OPTIONS = QFileDialog.Option.DontUseCustomDirectoryIcons
+
+# -------------------------------------------------------
+# Background jobs: keep slow file I/O off the GUI thread
+# -------------------------------------------------------
+class JobSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+class BackgroundJob(QRunnable):
+    """
+    Runs fn(*args) on the global QThreadPool and reports the result through
+    self.signals. The signals object is parented to a GUI widget, so connected
+    slots run on the GUI thread. Connect to the signals before calling start().
+    """
+    def __init__(self, parent, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = JobSignals(parent)
+
+    def start(self):
+        self.signals.finished.connect(self.signals.deleteLater)
+        self.signals.failed.connect(self.signals.deleteLater)
+        QThreadPool.globalInstance().start(self)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+# Previews longer than this many lines are appended in chunks from the event loop
+PREVIEW_CHUNK_LINES = 10000
+
+def fill_read_only_text(text_area, content):
+    """
+    Fill a read-only QPlainTextEdit with undo history and line wrapping disabled.
+    Large content is shown a chunk at a time so the dialog opens without blocking.
+    """
+    text_area.setReadOnly(True)
+    text_area.document().setUndoRedoEnabled(False)
+    text_area.setLineWrapMode(QPlainTextEdit.NoWrap)
+
+    if content.count("\n") < PREVIEW_CHUNK_LINES:
+        text_area.setPlainText(content)
+        return
+
+    lines = content.split("\n")
+    text_area.setPlainText("\n".join(lines[:PREVIEW_CHUNK_LINES]))
+    for start in range(PREVIEW_CHUNK_LINES, len(lines), PREVIEW_CHUNK_LINES):
+        chunk = "\n".join(lines[start:start + PREVIEW_CHUNK_LINES])
+        QTimer.singleShot(0, text_area, partial(text_area.appendPlainText, chunk))
+
+def write_text_file(path, text):
+    """
+    Write already-joined text to a file with a single write call.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+def write_bytes_file(path, data):
+    """
+    Write already-encoded bytes to a file with a single write call.
+    """
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+def dump_section_json(section_data):
+    """
+    Serialize section data to indented UTF-8 JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(section_data, option=orjson.OPT_INDENT_2)
+    return json.dumps(section_data, indent=2).encode("utf-8")
+
+def read_json_file(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return path, orjson.loads(raw)
+    return path, json.loads(raw)
 
 # -------------------------------------------------------
 # SectionWindow: Handles one UCI section (GLOBAL, FILES, etc.)
@@ -39,6 +297,11 @@ class SectionWindow(QDialog):
         main_layout = QVBoxLayout(self)
         self.input_fields = {}
 
+        # (field name, widget, required, is_date, placeholder) per field, resolved
+        # once so validation walks a flat list instead of re-reading field_info
+        self.field_specs = []
+        self.help_dialogs = {}  # Field name -> help QDialog, built on first click
+
         # Create labeled fields + help buttons
         for field_name, field_info in fields.items():
             row_layout = QHBoxLayout()
@@ -60,8 +323,6 @@ class SectionWindow(QDialog):
             elif isinstance(field_info, str):
                 placeholder_text = field_info
 
-            existing_val = initial_values.get(field_name, "")
-
             if is_date_field:
                 # Use QDateEdit for date fields
                 date_edit = QDateEdit(self)
@@ -72,30 +333,25 @@ class SectionWindow(QDialog):
                 # but we can set it on its internal lineEdit()
                 date_edit.lineEdit().setPlaceholderText(placeholder_text)
 
-                # Attempt to parse existing_val (YYYY/MM/DD)
-                parts = existing_val.split("/")
-                if len(parts) == 3:
-                    y, m, d = parts
-                    try:
-                        date_obj = QDate(int(y), int(m), int(d))
-                        if date_obj.isValid():
-                            date_edit.setDate(date_obj)
-                    except:
-                        pass
-
                 input_field = date_edit
                 # Connect dateChanged for dynamic enable
-                date_edit.dateChanged.connect(lambda _: self.on_field_changed())
+                date_edit.dateChanged.connect(lambda _: self.validate_fields())
 
             else:
                 # Normal QLineEdit
                 line_edit = QLineEdit(self)
-                line_edit.setText(existing_val)
                 line_edit.setPlaceholderText(placeholder_text)
                 input_field = line_edit
                 input_field.textChanged.connect(self.on_field_changed)
 
             self.input_fields[field_name] = input_field
+            self.field_specs.append((
+                field_name,
+                input_field,
+                bool(field_info.get("required", False)) if isinstance(field_info, dict) else False,
+                is_date_field,
+                placeholder_text,
+            ))
             row_layout.addWidget(input_field)
 
             # Info/help button
@@ -139,42 +395,102 @@ class SectionWindow(QDialog):
         main_layout.addLayout(button_layout)
         self.resize(600, 300)
 
+        # Coalesce bursts of textChanged (typing) into one validation pass
+        self.validate_timer = QTimer(self)
+        self.validate_timer.setSingleShot(True)
+        self.validate_timer.setInterval(80)
+        self.validate_timer.timeout.connect(self.validate_fields)
+
+        self.reload(initial_values)
+
+    def reload(self, values):
+        """
+        Puts the dialog back in its freshly-opened state, filled from values.
+        Lets the main window reuse one SectionWindow per section.
+        """
+        self.saved_data = {}
+        self.section_state = "empty"
+        self.validate_timer.stop()
+        self.field_valid = {}  # Last highlight state applied to each field
+
+        for field_name, widget, _, is_date, placeholder in self.field_specs:
+            existing_val = values.get(field_name, "")
+            widget.blockSignals(True)
+
+            if is_date:
+                date_obj = QDate(2000, 1, 1)  # QDateEdit's default date
+
+                # Attempt to parse existing_val (YYYY/MM/DD)
+                parts = existing_val.split("/")
+                if len(parts) == 3:
+                    y, m, d = parts
+                    try:
+                        parsed = QDate(int(y), int(m), int(d))
+                        if parsed.isValid():
+                            date_obj = parsed
+                    except ValueError:
+                        pass
+
+                widget.setDate(date_obj)
+                widget.lineEdit().setPlaceholderText(placeholder)
+            else:
+                widget.setText(existing_val)
+                widget.setPlaceholderText(placeholder)
+
+            widget.blockSignals(False)
+            widget.setStyleSheet("")
+            self.field_valid[field_name] = True
+
+        self.preview_button.setEnabled(False)
+        self.save_button.setEnabled(False)
+
     def on_field_changed(self):
+        """
+        Schedule validate_fields(); restarting the timer on every keystroke
+        means fast typing only validates once it pauses.
+        """
+        self.validate_timer.start()
+
+    def validate_fields(self):
         """
         Check if there's at least one filled field (-> enable Save),
         and if all required fields are filled (-> enable Preview).
         Highlight invalid or empty required fields.
         """
+        self.validate_timer.stop()
         required_filled = True
         any_filled = False
 
-        for field_name, field_info in self.fields.items():
-            widget = self.input_fields[field_name]
+        for field_name, widget, required, is_date, placeholder in self.field_specs:
             is_valid = True
 
             # Extract the current value
-            if isinstance(widget, QDateEdit):
+            if is_date:
                 val = widget.date().toString("yyyy/MM/dd").strip()
                 # Validate date fields if required
-                if field_info.get("required", False) and not widget.date().isValid():
+                if required and not widget.date().isValid():
                     is_valid = False
             else:
                 val = widget.text().strip()
                 # Check if required text fields are filled
-                if field_info.get("required", False) and not val:
+                if required and not val:
                     is_valid = False
 
-            # Highlight invalid fields
-            if not is_valid:
-                widget.setStyleSheet("border: 1px solid orange;")
-                placeholder_error = field_info.get("placeholder", "") + " (Required)"
-                if isinstance(widget, QDateEdit):
-                    widget.lineEdit().setPlaceholderText(placeholder_error)
+            # Highlight invalid fields; Qt restyles on every setStyleSheet call,
+            # so the widget is only touched when its state actually flips
+            if is_valid != self.field_valid[field_name]:
+                self.field_valid[field_name] = is_valid
+                if not is_valid:
+                    widget.setStyleSheet("border: 1px solid orange;")
+                    placeholder_error = placeholder + " (Required)"
+                    if is_date:
+                        widget.lineEdit().setPlaceholderText(placeholder_error)
+                    else:
+                        widget.setPlaceholderText(placeholder_error)
                 else:
-                    widget.setPlaceholderText(placeholder_error)
+                    widget.setStyleSheet("")  # Reset style if valid
+            if not is_valid:
                 required_filled = False
-            else:
-                widget.setStyleSheet("")  # Reset style if valid
 
             if val:
                 any_filled = True
@@ -217,11 +533,15 @@ class SectionWindow(QDialog):
         Clears all fields in this section (makes them empty),
         sets section_state to 'empty', and resets color in main window.
         """
+        # Clear without firing on_field_changed per widget, then validate once
         for field_name, widget in self.input_fields.items():
+            widget.blockSignals(True)
             if isinstance(widget, QDateEdit):
                 widget.lineEdit().clear()
             else:
                 widget.clear()
+            widget.blockSignals(False)
+        self.validate_fields()
 
         self.section_state = "empty"
         self.preview_button.setEnabled(False)
@@ -241,9 +561,8 @@ class SectionWindow(QDialog):
         required_count = 0
         required_filled_count = 0
 
-        for field_name, field_info in self.fields.items():
-            widget = self.input_fields[field_name]
-            if isinstance(widget, QDateEdit):
+        for field_name, widget, required, is_date, _ in self.field_specs:
+            if is_date:
                 val = widget.date().toString("yyyy/MM/dd")
             else:
                 val = widget.text().strip()
@@ -251,7 +570,7 @@ class SectionWindow(QDialog):
             self.saved_data[field_name] = val
 
             # Count required fields
-            if isinstance(field_info, dict) and field_info.get("required", False):
+            if required:
                 required_count += 1
                 if val:
                     required_filled_count += 1
@@ -279,7 +598,13 @@ class SectionWindow(QDialog):
     def show_help(self, field_name, help_text, pdf_page):
         """
         Shows a small QDialog with help text and an optional link to the PDF.
+        The dialog is built on first use and reused for later clicks.
         """
+        dialog = self.help_dialogs.get(field_name)
+        if dialog is not None:
+            dialog.exec()
+            return
+
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Help for {field_name}")
         layout = QVBoxLayout(dialog)
@@ -298,6 +623,7 @@ class SectionWindow(QDialog):
         close_button.clicked.connect(dialog.close)
         layout.addWidget(close_button)
 
+        self.help_dialogs[field_name] = dialog
         dialog.exec()
 
 class PreviewDialog(QDialog):
@@ -308,14 +634,14 @@ class PreviewDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.resize(width, height)
+        self.content = content  # Source of truth for Copy/Save; the widget is display-only
 
         # Main layout
         layout = QVBoxLayout(self)
 
         # Text area
         self.text_area = QPlainTextEdit()
-        self.text_area.setReadOnly(True)
-        self.text_area.setPlainText(content)
+        fill_read_only_text(self.text_area, content)
         layout.addWidget(self.text_area)
 
         # Buttons layout
@@ -342,79 +668,209 @@ class PreviewDialog(QDialog):
         """
         Copies the content of the text area to the clipboard.
         """
-        text = self.text_area.toPlainText()
-        QApplication.clipboard().setText(text)
+        QApplication.clipboard().setText(self.content)
         QMessageBox.information(self, "Copied", "Text has been copied to clipboard.")
 
     def save_to_file(self):
         """
         Opens a file dialog to save the content as a .txt file.
         """
-        file_dialog = QFileDialog(self)
-        save_path, _ = file_dialog.getSaveFileName(
-            self, "Save File", "", "Text Files (*.txt);;All Files (*)"
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save File", "", "Text Files (*.txt);;All Files (*)",
+            options=FILE_DIALOG_OPTIONS
         )
         if save_path:
-            try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    f.write(self.text_area.toPlainText())
-                QMessageBox.information(self, "Success", f"File saved to {save_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save file:\n{e}")
+            job = BackgroundJob(self, write_text_file, save_path, self.content)
+            job.signals.finished.connect(self.on_file_saved)
+            job.signals.failed.connect(self.on_save_failed)
+            job.start()
+
+    def on_file_saved(self, save_path):
+        QMessageBox.information(self, "Success", f"File saved to {save_path}")
+
+    def on_save_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to save file:\n{error}")
 
 # -------------------------------------------------------
 # Functions for Parsing the Diagram and Summaries
 # -------------------------------------------------------
-def parse_shapes(root):
-    shapes_by_id = {}
-    shape_cells = root.xpath(".//mxCell[@vertex='1']")
-    for cell in shape_cells:
-        internal_id = cell.get("id", "").strip()
-        style = cell.get("style", "").lower()
-        label = cell.get("value", "").strip()
 
-        if not internal_id:
-            continue
+# iterparse options for Draw.io files: no ID table, blank text or comments are needed
+DRAWIO_ITERPARSE_OPTIONS = dict(
+    collect_ids=False, remove_blank_text=True, remove_comments=True, huge_tree=True
+)
 
-        recognized = False
-        if "ellipse;" in style:
-            hydro_type = "Subcatchment"
-            recognized = True
-        elif "shape=hexagon" in style:
-            hydro_type = "RCHRES"
-            recognized = True
-        elif "shape=waypoint" in style and "perimeter=centerperimeter" in style:
-            hydro_type = "Node"
-            recognized = True
-        elif "triangle;" in style:
-            hydro_type = "SWM Facility"
-            recognized = True
-        else:
-            hydro_type = "Comment/Note"
-
-        if not recognized:
-            print(f"WARNING: Shape ID {internal_id} style '{style}' not recognized; using Comment/Note.")
-
-        shapes_by_id[internal_id] = {
-            "id": internal_id,
-            "label": label,
-            "hydro_type": hydro_type,
-            "incoming": [],
-            "outgoing": []
-        }
-    return shapes_by_id
+# (style markers, hydro type) pairs checked in order against the lowercased
+# shape style; every marker of a rule must be present for it to match
+SHAPE_STYLE_RULES = (
+    (("ellipse;",), "Subcatchment"),
+    (("shape=hexagon",), "RCHRES"),
+    (("shape=waypoint", "perimeter=centerperimeter"), "Node"),
+    (("triangle;",), "SWM Facility"),
+)
+
+@dataclass(slots=True)
+class Connection:
+    """
+    One edge between two recognized shapes; flow_type is "Surface" or "Groundwater".
+    The same record is shared by the source's outgoing and the target's incoming list.
+    """
+    source: str
+    target: str
+    flow_type: str
+
+@dataclass(slots=True)
+class Shape:
+    """
+    One recognized diagram shape. incoming/outgoing hold the Connection records
+    added by build_graph.
+    """
+    id: str
+    label: str
+    hydro_type: str
+    incoming: list = field(default_factory=list)
+    outgoing: list = field(default_factory=list)
+
+@lru_cache(maxsize=1024)
+def classify_style(style):
+    """
+    Return the hydro type for a lowercased shape style, or None if no rule matches.
+    Diagrams reuse a handful of styles, so each distinct style is only scanned once.
+    """
+    return next(
+        (h_type for markers, h_type in SHAPE_STYLE_RULES
+         if all(marker in style for marker in markers)),
+        None
+    )
+
+def parse_shape_cell(cell):
+    """
+    Build the shape record for one vertex mxCell, or None if it has no ID.
+    """
+    internal_id = cell.get("id", "").strip()
+    style = cell.get("style", "").lower()
+    label = cell.get("value", "").strip()
+
+    if not internal_id:
+        return None
+
+    hydro_type = classify_style(style)
+    if hydro_type is None:
+        hydro_type = "Comment/Note"
+        logger.warning("Shape ID %s style '%s' not recognized; using Comment/Note.", internal_id, style)
+
+    return Shape(internal_id, label, hydro_type)
 
-def parse_edges(root):
+def parse_edge_cell(cell):
+    """
+    Build the (source, target, flow_type) tuple for one edge mxCell,
+    or None if either end is missing. Dashed edges are groundwater flow.
+    """
+    src_id = cell.get("source", "").strip()
+    tgt_id = cell.get("target", "").strip()
+
+    if src_id and tgt_id:
+        style = cell.get("style", "").lower()
+        flow_type = "Groundwater" if "dashed=1" in style else "Surface"
+        return (src_id, tgt_id, flow_type)
+    return None
+
+def parse_diagram(source):
+    """
+    Stream every mxCell of a Draw.io file once, collecting shapes (vertex cells)
+    and edges (edge cells). Each cell is freed as soon as it has been read, so the
+    whole document tree is never held in memory. Returns (shapes_by_id, edges).
+    """
+    from lxml import etree  # Deferred: only needed once a diagram is imported
+
+    shapes_by_id = {}
     edges = []
-    edge_cells = root.xpath(".//mxCell[@edge='1']")
-    for cell in edge_cells:
-        src_id = cell.get("source", "").strip()
-        tgt_id = cell.get("target", "").strip()
-        style = cell.get("style", "").lower() if cell.get("style") else ""
+    for _, cell in etree.iterparse(source, events=("end",), tag="{*}mxCell",
+                                   **DRAWIO_ITERPARSE_OPTIONS):
+        if cell.get("vertex") == "1":
+            shape = parse_shape_cell(cell)
+            if shape is not None:
+                shapes_by_id[shape.id] = shape
+        elif cell.get("edge") == "1":
+            edge = parse_edge_cell(cell)
+            if edge is not None:
+                edges.append(edge)
+
+        # Drop this cell and the already-processed siblings before it
+        cell.clear()
+        while cell.getprevious() is not None:
+            del cell.getparent()[0]
+    return shapes_by_id, edges
+
+def drawio_cache_path(xml_file):
+    """
+    Return the cache file path for a Draw.io file, keyed by its path, mtime, size
+    and DRAWIO_CACHE_VERSION.
+    """
+    stat = os.stat(xml_file)
+    key_src = (
+        f"{DRAWIO_CACHE_VERSION}|{os.path.abspath(xml_file)}|{stat.st_mtime_ns}|{stat.st_size}"
+    )
+    key = hashlib.blake2b(key_src.encode("utf-8")).hexdigest()
+    return os.path.join(DRAWIO_CACHE_DIR, f"{key}.json")
+
+def load_cached_shapes(xml_file):
+    """
+    Return the cached shapes_by_id for a Draw.io file, or None on a cache miss.
+    """
+    try:
+        cache_path = drawio_cache_path(xml_file)
+        _, cached = read_json_file(cache_path)
+        # Decoded strings are fresh objects; intern the few type names so all
+        # shapes share one object per name and comparisons hit the identity fast path
+        shapes_by_id = {}
+        records = {}  # (source, target, flow_type) -> outgoing records not yet matched
+        for sid, data in cached.items():
+            data["hydro_type"] = sys.intern(data["hydro_type"])
+            outgoing = []
+            for c in data["outgoing"]:
+                connection = Connection(c["source"], c["target"], sys.intern(c["flow_type"]))
+                outgoing.append(connection)
+                key = (connection.source, connection.target, connection.flow_type)
+                records.setdefault(key, deque()).append(connection)
+            data["outgoing"] = outgoing
+            shapes_by_id[sid] = Shape(**data)
+
+        # Point each incoming entry at its source's record, in the cached order,
+        # so the object graph matches what build_graph produces
+        for shape in shapes_by_id.values():
+            shape.incoming = [
+                records[(c["source"], c["target"], c["flow_type"])].popleft()
+                for c in shape.incoming
+            ]
+        os.utime(cache_path)  # Mark as recently used
+    except (OSError, ValueError, TypeError, AttributeError, KeyError, IndexError):
+        return None
+    return shapes_by_id
 
-        if src_id and tgt_id:
-            edges.append((src_id, tgt_id, style))
-    return edges
+def save_cached_shapes(xml_file, shapes_by_id):
+    """
+    Write shapes_by_id to the cache and evict the least recently used entries.
+    Cache failures are not fatal; the diagram is simply re-parsed next time.
+    """
+    try:
+        cache_path = drawio_cache_path(xml_file)
+        os.makedirs(DRAWIO_CACHE_DIR, exist_ok=True)
+        if orjson is not None:
+            data = orjson.dumps(shapes_by_id)  # Serializes the dataclasses natively
+        else:
+            data = json.dumps({sid: asdict(shape) for sid, shape in shapes_by_id.items()}).encode("utf-8")
+        write_bytes_file(cache_path, data)
+
+        entries = [
+            os.path.join(DRAWIO_CACHE_DIR, name)
+            for name in os.listdir(DRAWIO_CACHE_DIR) if name.endswith(".json")
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for stale in entries[DRAWIO_CACHE_MAX_ENTRIES:]:
+            os.remove(stale)
+    except OSError as e:
+        logger.warning("Could not write Draw.io cache: %s", e)
 
 def normalize_target_types(shapes_by_id):
     """
@@ -422,115 +878,131 @@ def normalize_target_types(shapes_by_id):
     are classified as RCHRES if applicable.
     """
     for shape_id, data in shapes_by_id.items():
-        label = data.get("label", "")
-        hydro_type = data.get("hydro_type", "")
+        label = data.label
+        hydro_type = data.hydro_type
 
         # Normalize Node and SWM Facility to RCHRES if the label is numeric
         if hydro_type in ["Node", "SWM Facility"] and label.isdigit():
-            print(f"Normalizing {label}: {hydro_type} -> RCHRES")  # Debug
-            shapes_by_id[shape_id]["hydro_type"] = "RCHRES"
+            logger.debug("Normalizing %s: %s -> RCHRES", label, hydro_type)
+            shapes_by_id[shape_id].hydro_type = "RCHRES"
 
 def build_graph(shapes_by_id, edges):
-    for (src, tgt, style) in edges:
+    for (src, tgt, flow_type) in edges:
         if src in shapes_by_id and tgt in shapes_by_id:
-            flow_type = "Groundwater" if "dashed=1" in style else "Surface"
-            shapes_by_id[src]["outgoing"].append({"target": tgt, "flow_type": flow_type})
-            shapes_by_id[tgt]["incoming"].append({"source": src, "flow_type": flow_type})
+            connection = Connection(src, tgt, flow_type)
+            shapes_by_id[src].outgoing.append(connection)
+            shapes_by_id[tgt].incoming.append(connection)
 
-def compute_branch_length(shapes_by_id, start_id, memo=None):
+def compute_branch_lengths(shapes_by_id, start_ids=None, memo=None):
+    """
+    Fill memo with the longest downstream path length (a sink counts as 1) of
+    every shape reachable from start_ids (default: all shapes) and return it.
+    All starts share one explicit post-order stack, so deep models don't hit the
+    recursion limit and nothing is walked twice.
+    """
     if memo is None:
         memo = {}
-    if start_id in memo:
-        return memo[start_id]
-
-    outgoings = shapes_by_id[start_id]["outgoing"]
-    if not outgoings:
-        memo[start_id] = 1
-        return 1
-
-    max_depth = 0
-    for out_dict in outgoings:
-        tgt_id = out_dict["target"]
-        depth_tgt = compute_branch_length(shapes_by_id, tgt_id, memo)
-        if depth_tgt > max_depth:
-            max_depth = depth_tgt
-    memo[start_id] = 1 + max_depth
-    return memo[start_id]
+    if start_ids is None:
+        start_ids = list(shapes_by_id)
+
+    # Starts are pushed in reverse so they're finished in the given order
+    on_path = set()
+    stack = deque((sid, False) for sid in reversed(start_ids))
+    while stack:
+        node_id, children_done = stack.pop()
+        outgoings = shapes_by_id[node_id].outgoing
+
+        if children_done:
+            # All children are finished; targets on a cycle count as 0
+            on_path.discard(node_id)
+            memo[node_id] = 1 + max(
+                (memo.get(od.target, 0) for od in outgoings), default=0
+            )
+            continue
+
+        if node_id in memo or node_id in on_path:
+            continue
+        on_path.add(node_id)
+        stack.append((node_id, True))
+        for connection in outgoings:
+            if connection.target not in memo:
+                stack.append((connection.target, False))
+
+    return memo
+
+def compute_branch_length(shapes_by_id, start_id, memo=None):
+    """
+    Length of the longest downstream path from start_id (a sink counts as 1).
+    """
+    return compute_branch_lengths(shapes_by_id, [start_id], memo)[start_id]
 
 def narrative_summary(shapes_by_id):
-    visited_lines = set()
-    visited_targets = set()
+    """
+    Describe every flow path in topological order (Kahn's algorithm): a shape's
+    discharges are listed once everything draining into it has been listed.
+    """
     lines = []
 
-    memo_lengths = {}
-    for sid in shapes_by_id:
-        compute_branch_length(shapes_by_id, sid, memo_lengths)
-
-    def add_line(source_id, target_id, flow_type):
-        line_key = (source_id, target_id, flow_type)
-        if line_key in visited_lines:
-            return
-        visited_lines.add(line_key)
+    memo_lengths = compute_branch_lengths(shapes_by_id)
 
-        source_data = shapes_by_id[source_id]
-        target_data = shapes_by_id[target_id]
-        src_type = source_data["hydro_type"]
-        src_label = source_data["label"] or source_id
-        tgt_type = target_data["hydro_type"]
-        tgt_label = target_data["label"] or target_id
+    # (hydro_type, display label) per shape, looked up once per line
+    display_names = {
+        sid: (data.hydro_type, data.label or sid)
+        for sid, data in shapes_by_id.items()
+    }
 
-        flow_txt = "(Surface)" if flow_type == "Surface" else "(Groundwater)"
-        lines.append(f"{src_type} {src_label} discharges {flow_txt} to {tgt_type} {tgt_label}.")
+    indegree = {sid: len(data.incoming) for sid, data in shapes_by_id.items()}
+    queue = deque(sid for sid, count in indegree.items() if count == 0)
 
-    def process_target(tid):
-        if tid in visited_targets:
-            return
-        for inc_dict in shapes_by_id[tid]["incoming"]:
-            inc_id = inc_dict["source"]
-            fl_type = inc_dict["flow_type"]
-            if (inc_id, tid, fl_type) not in visited_lines:
-                process_target(inc_id)
-                add_line(inc_id, tid, fl_type)
-
-        outgoings = shapes_by_id[tid]["outgoing"]
+    def emit(sid):
+        data = shapes_by_id[sid]
+        outgoings = data.outgoing
         if not outgoings:
-            data = shapes_by_id[tid]
-            if data["hydro_type"] != "Comment/Note":
-                lines.append(f"{data['hydro_type']} {data['label']} does not discharge to any recognized element.")
-        else:
-            out_sorted = sorted(
-                outgoings, key=lambda od: memo_lengths[od["target"]], reverse=True
-            )
-            for outd in out_sorted:
-                nxt_id = outd["target"]
-                fl_type = outd["flow_type"]
-                add_line(tid, nxt_id, fl_type)
-                process_target(nxt_id)
-
-        visited_targets.add(tid)
-
-    # Start with shapes that have no incoming edges
-    start_shapes = [
-        sid for sid, data in shapes_by_id.items()
-        if data["hydro_type"] != "Comment/Note" and not data["incoming"]
-    ]
-    for s_id in start_shapes:
-        process_target(s_id)
-
-    for sid in shapes_by_id:
-        if sid not in visited_targets:
-            process_target(sid)
+            if data.hydro_type != "Comment/Note":
+                lines.append(f"{data.hydro_type} {data.label} does not discharge to any recognized element.")
+            return
+
+        # Longest branch first. Sorted copy: outgoing order is diagram order elsewhere
+        if len(outgoings) > 1:
+            outgoings = sorted(outgoings, key=lambda od: memo_lengths[od.target], reverse=True)
+
+        src_type, src_label = display_names[sid]
+        emitted = set()  # Parallel duplicate edges are described once
+        for outd in outgoings:
+            tgt_id = outd.target
+            flow_type = outd.flow_type
+            if (tgt_id, flow_type) not in emitted:
+                emitted.add((tgt_id, flow_type))
+                tgt_type, tgt_label = display_names[tgt_id]
+                flow_txt = "(Surface)" if flow_type == "Surface" else "(Groundwater)"
+                lines.append(f"{src_type} {src_label} discharges {flow_txt} to {tgt_type} {tgt_label}.")
+
+            indegree[tgt_id] -= 1
+            if indegree[tgt_id] == 0:
+                queue.append(tgt_id)
+
+    remaining = iter(shapes_by_id)
+    while True:
+        while queue:
+            emit(queue.popleft())
+
+        # Shapes on a cycle never reach in-degree 0; restart from the first one left
+        cycle_start = next((sid for sid in remaining if indegree[sid] > 0), None)
+        if cycle_start is None:
+            break
+        indegree[cycle_start] = 0
+        queue.append(cycle_start)
 
     # highlight orphans
     orphans = []
     for sid, data in shapes_by_id.items():
-        if not data["incoming"] and not data["outgoing"] and data["hydro_type"] != "Comment/Note":
+        if not data.incoming and not data.outgoing and data.hydro_type != "Comment/Note":
             orphans.append(sid)
     if orphans:
         lines.append("The following shapes are not connected to any flow path:")
         for o_id in orphans:
-            lbl = shapes_by_id[o_id]["label"] or o_id
-            lines.append(f"  - {shapes_by_id[o_id]['hydro_type']} {lbl}")
+            o_type, o_label = display_names[o_id]
+            lines.append(f"  - {o_type} {o_label}")
         lines.append("")
 
     return "\n".join(lines)
@@ -544,8 +1016,7 @@ class ModelSummaryDialog(QDialog):
         layout = QVBoxLayout()
 
         self.text_area = QPlainTextEdit()
-        self.text_area.setReadOnly(True)
-        self.text_area.setPlainText(summary_text)
+        fill_read_only_text(self.text_area, summary_text)
         layout.addWidget(self.text_area)
 
         button_layout = QHBoxLayout()
@@ -563,26 +1034,87 @@ class ModelSummaryDialog(QDialog):
         self.resize(800, 600)
 
     def save_summary(self):
-        file_dialog = QFileDialog(self)
-        file_path, _ = file_dialog.getSaveFileName(
-            self, "Save Summary", "", "Text Files (*.txt);;All Files (*)"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Summary", "", "Text Files (*.txt);;All Files (*)",
+            options=FILE_DIALOG_OPTIONS
         )
         if file_path:
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(self.summary_text)
-                QMessageBox.information(self, "Success", f"Summary saved to {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error saving file:\n{e}")
+            job = BackgroundJob(self, write_text_file, file_path, self.summary_text)
+            job.signals.finished.connect(self.on_summary_saved)
+            job.signals.failed.connect(self.on_save_failed)
+            job.start()
+
+    def on_summary_saved(self, file_path):
+        QMessageBox.information(self, "Success", f"Summary saved to {file_path}")
+
+    def on_save_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Error saving file:\n{error}")
 
 # -------------------------------------------------------
 # UCIFileGeneratorApp: Main Window
 # -------------------------------------------------------
+APP_ICON_PATH = "Icon.png"  # Window icon and title-bar logo
+
+# Dark theme for the main window
+MAIN_STYLE_SHEET = """
+    QMainWindow {
+        background-color: #1e1e1e;  /* Dark gray background */
+        color: #e1e6e8;  /* Light text for readability */
+    }
+    
+    QPushButton {
+        background-color: #2b2b2b;  /* black background */
+        color: #e1e6e8;  /* White text */
+        border-radius: 15px;  /* Rounded corners */
+        padding: 6px 12px;  /* Padding */
+        font-size: 14px;  /* Font size */
+    }
+    QPushButton:hover {
+        background-color: #333333;  /* dark blue on hover */
+    }
+    QGroupBox {
+        font-size: 16px;  /* Group box title font size */
+        font-weight: bold;  /* Bold group box title */
+        color: #e1e6e8;  /* White text */
+        border: 2px solid gray;  /* Gray border */
+        border-radius: 10px;  /* Rounded group box */
+        margin-top: 10px;  /* Margin above the group box */
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;  /* Title position */
+        padding: 0 5px;  /* Padding around title */
+    }
+    QPushButton[tickState="empty"] {
+        background-color: grey;  /* No file loaded yet */
+        color: white;
+        font-weight: bold;
+        border-radius: 15px;
+    }
+    QPushButton[tickState="loaded"] {
+        background-color: green;  /* File loaded */
+        color: white;
+        font-weight: bold;
+        border-radius: 15px;
+    }
+"""
+
+@lru_cache(maxsize=None)
+def app_icon_pixmap():
+    """
+    The app icon, read and decoded from disk once (needs a QApplication).
+    """
+    return QPixmap(APP_ICON_PATH)
+
 class UCIFileGeneratorApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.loaded_excel_file = None  # Store the loaded Excel file path
         self.drainage_area_mapping = None  # Store the drainage area mapping
+        self.drainage_area_cache = {}  # path -> ((path, mtime, size), mapping), latest load only
+        self.show_network_after_excel = False  # Open NETWORK once a pending Excel load finishes
+        self.excel_load_in_progress = False  # A worker is reading a workbook
+        self.network_block_inputs = None  # (shapes_by_id, drainage mapping) self.network_block was built from
 
         self.pdf_base_url = (
             "https://hydrologicmodels.tamu.edu/wp-content/uploads/sites/103/2018/09/HSPF_User-Manual.pdf"
@@ -594,44 +1126,18 @@ class UCIFileGeneratorApp(QMainWindow):
         self.setGeometry(100, 100, 900, 600)  # Increased size for better spacing
 
         # Set the application icon
-        self.setWindowIcon(QIcon("Icon.png"))  # Replace 'icon.ico' with your icon file path
+        self.setWindowIcon(QIcon(app_icon_pixmap()))
 
         # Apply stylesheet for modern UI
-        style_sheet = """
-        QMainWindow {
-            background-color: #1e1e1e;  /* Dark gray background */
-            color: #e1e6e8;  /* Light text for readability */
-        }
-        
-        QPushButton {
-            background-color: #2b2b2b;  /* black background */
-            color: #e1e6e8;  /* White text */
-            border-radius: 15px;  /* Rounded corners */
-            padding: 6px 12px;  /* Padding */
-            font-size: 14px;  /* Font size */
-        }
-        QPushButton:hover {
-            background-color: #333333;  /* dark blue on hover */
-        }
-        QGroupBox {
-            font-size: 16px;  /* Group box title font size */
-            font-weight: bold;  /* Bold group box title */
-            color: #e1e6e8;  /* White text */
-            border: 2px solid gray;  /* Gray border */
-            border-radius: 10px;  /* Rounded group box */
-            margin-top: 10px;  /* Margin above the group box */
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            subcontrol-position: top left;  /* Title position */
-            padding: 0 5px;  /* Padding around title */
-        }
-        """
-        self.setStyleSheet(style_sheet)
+        self.setStyleSheet(MAIN_STYLE_SHEET)
 
         self.section_buttons = {}
+        self.help_dialogs = {}  # Section name -> help QDialog, built on first click
+        self.section_windows = {}  # SectionWindow per section, built on first open
         self.shapes_by_id = {}
         self.section_data = {}
+        self.section_data_dirty = True  # section_data edited since section_json was built
+        self.section_json = None  # Serialized section_data from the last save
 
         # Main layout for the window
         main_layout = QVBoxLayout()
@@ -661,8 +1167,7 @@ class UCIFileGeneratorApp(QMainWindow):
 
         # Add logo to the title bar
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Icon.png")  # Replace with your logo image path
-        logo_label.setPixmap(logo_pixmap.scaled(30, 30, Qt.KeepAspectRatio))  # Adjust size
+        logo_label.setPixmap(app_icon_pixmap().scaled(30, 30, Qt.KeepAspectRatio))  # Adjust size
         layout.addWidget(logo_label)
 
         # Window title
@@ -723,9 +1228,7 @@ class UCIFileGeneratorApp(QMainWindow):
         # Tick mark for Import Draw.io File
         self.drawio_tick_button = QPushButton("✔")
         self.drawio_tick_button.setFixedSize(35, 35)
-        self.drawio_tick_button.setStyleSheet(
-            "background-color: grey; color: white; font-weight: bold; border-radius: 15px;"
-        )
+        self.drawio_tick_button.setProperty("tickState", "empty")  # Styled by MAIN_STYLE_SHEET
         self.drawio_tick_button.setToolTip("No file selected")  # Default tooltip
         self.drawio_tick_button.clicked.connect(self.toggle_drawio_tooltip)  # Fixed method
         drawio_layout.addWidget(self.drawio_tick_button)
@@ -740,9 +1243,7 @@ class UCIFileGeneratorApp(QMainWindow):
         # Tick mark for Load JSON
         self.json_tick_button = QPushButton("✔")
         self.json_tick_button.setFixedSize(35, 35)
-        self.json_tick_button.setStyleSheet(
-            "background-color: grey; color: white; font-weight: bold; border-radius: 15px;"
-        )
+        self.json_tick_button.setProperty("tickState", "empty")  # Styled by MAIN_STYLE_SHEET
         self.json_tick_button.setToolTip("No file selected")  # Default tooltip
         self.json_tick_button.clicked.connect(self.toggle_json_tooltip)  # Fixed method
         json_layout.addWidget(self.json_tick_button)
@@ -758,9 +1259,7 @@ class UCIFileGeneratorApp(QMainWindow):
         # Tick mark for Load Excel File
         self.excel_tick_button = QPushButton("✔")
         self.excel_tick_button.setFixedSize(35, 35)
-        self.excel_tick_button.setStyleSheet(
-            "background-color: grey; color: white; font-weight: bold; border-radius: 15px;"
-        )
+        self.excel_tick_button.setProperty("tickState", "empty")  # Styled by MAIN_STYLE_SHEET
         self.excel_tick_button.setToolTip("No file selected")  # Default tooltip
         self.excel_tick_button.clicked.connect(self.toggle_excel_tooltip)
         excel_layout.addWidget(self.excel_tick_button)
@@ -797,36 +1296,9 @@ class UCIFileGeneratorApp(QMainWindow):
         sections_layout = QVBoxLayout()
 
         # Add buttons for each section with revised help text and manual links
-        self.add_section_button(sections_layout, "GLOBAL",
-                                "Specifies the global simulation parameters, including model name, time step, simulation start/end dates, and unit system.",
-                                self.global_section, pdf_page=28)
-        self.add_section_button(sections_layout, "FILES",
-                                "Defines the input and output file configurations, including WDM files, error logs, and message logs used by the simulation.",
-                                self.files_section, pdf_page=52)
-        self.add_section_button(sections_layout, "OPN SEQUENCE",
-                                "Specifies the sequence of operations for hydrologic and hydraulic processes, such as subcatchments, reaches, and reservoirs.",
-                                self.opn_sequence_section, pdf_page=53)
-        self.add_section_button(sections_layout, "PERLND",
-                                "Defines parameters for pervious land areas, including surface runoff, infiltration, and interflow processes.",
-                                self.perlnd_section, pdf_page=66)
-        self.add_section_button(sections_layout, "IMPLND",
-                                "Specifies parameters for impervious land areas, focusing on surface runoff processes and water balance calculations.",
-                                self.implnd_section, pdf_page=68)
-        self.add_section_button(sections_layout, "RCHRES",
-                                "Manages routing and storage for reaches and reservoirs, including flow routing, sediment transport, and water quality simulations.",
-                                self.rchres_section, pdf_page=70)
-        self.add_section_button(sections_layout, "FTABLES",
-                                "Defines flow tables (FTABLEs) for routing water through channels and reservoirs, specifying stage-discharge relationships.",
-                                self.ftables_section, pdf_page=72)
-        self.add_section_button(sections_layout, "EXT SOURCES",
-                                "Specifies external sources of input, including precipitation, point source flows, and other inflows to the hydrologic system.",
-                                self.ext_sources_section, pdf_page=74)
-        self.add_section_button(sections_layout, "EXT TARGETS",
-                                "Defines output targets for external inputs, such as monitoring locations or downstream flow points.",
-                                self.ext_targets_section, pdf_page=76)
-        self.add_section_button(sections_layout, "NETWORK",
-                                "Specifies flow relationships between elements like pervious land, impervious land, reaches, and reservoirs.",
-                                self.network_section, pdf_page=78)
+        for section_name, help_text, method_name, pdf_page in SECTION_BUTTONS:
+            self.add_section_button(sections_layout, section_name, help_text,
+                                    getattr(self, method_name), pdf_page=pdf_page)
 
         sections_group.setLayout(sections_layout)
         return sections_group
@@ -845,9 +1317,7 @@ class UCIFileGeneratorApp(QMainWindow):
         help_button.setMaximumWidth(30)
 
         # Pass detailed help text and PDF page to the help dialog
-        help_button.clicked.connect(
-            lambda: self.show_help(section_name, help_text, pdf_page)
-        )
+        help_button.clicked.connect(partial(self.show_help, section_name, help_text, pdf_page))
         section_layout.addWidget(section_button)
         section_layout.addWidget(help_button)
         layout.addLayout(section_layout)
@@ -857,7 +1327,13 @@ class UCIFileGeneratorApp(QMainWindow):
     def show_help(self, title, message, pdf_page=None):
         """
         Displays a help dialog with detailed text and a link to the manual page.
+        The dialog is built on first use and reused for later clicks.
         """
+        dialog = self.help_dialogs.get(title)
+        if dialog is not None:
+            dialog.exec()
+            return
+
         dialog = QDialog(self)
         dialog.setWindowTitle(f"Help for {title}")
         layout = QVBoxLayout(dialog)
@@ -878,6 +1354,7 @@ class UCIFileGeneratorApp(QMainWindow):
         layout.addWidget(close_button)
 
         dialog.setLayout(layout)
+        self.help_dialogs[title] = dialog
         dialog.exec()
 
     # -----------------------------------------
@@ -887,43 +1364,61 @@ class UCIFileGeneratorApp(QMainWindow):
         """
         Load a JSON file and update the tick mark button.
         """
-        file_dialog = QFileDialog(self)
-        json_file, _ = file_dialog.getOpenFileName(
-            self, "Select JSON File", "", "JSON Files (*.json);;All Files (*)"
+        json_file, _ = QFileDialog.getOpenFileName(
+            self, "Select JSON File", "", "JSON Files (*.json);;All Files (*)",
+            options=FILE_DIALOG_OPTIONS
         )
         if not json_file:
             QMessageBox.warning(self, "No File", "No JSON file selected.")
             return
 
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.section_data = data if isinstance(data, dict) else {}
+        job = BackgroundJob(self, read_json_file, json_file)
+        job.signals.finished.connect(self.on_json_loaded)
+        job.signals.failed.connect(self.on_json_load_failed)
+        job.start()
 
-            # Update tickmark button style and tooltip
-            self.json_tick_button.setStyleSheet(
-                "background-color: green; color: white; font-weight: bold; border-radius: 15px;"
-            )
-            self.update_file_tooltip(self.json_tick_button, json_file)
+    def on_json_loaded(self, result):
+        json_file, data = result
+        self.section_data = data if isinstance(data, dict) else {}
+        self.section_data_dirty = True
 
-            QMessageBox.information(self, "Success", "JSON file has been loaded successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load JSON file:\n{e}")
+        # Update tickmark button style and tooltip
+        self.mark_file_loaded(self.json_tick_button)
+        self.update_file_tooltip(self.json_tick_button, json_file)
+
+        QMessageBox.information(self, "Success", "JSON file has been loaded successfully.")
+
+    def on_json_load_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to load JSON file:\n{error}")
 
     def save_json_data(self):
-        file_dialog = QFileDialog(self)
-        save_path, _ = file_dialog.getSaveFileName(
-            self, "Save JSON File", "", "JSON Files (*.json);;All Files (*)"
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save JSON File", "", "JSON Files (*.json);;All Files (*)",
+            options=FILE_DIALOG_OPTIONS
         )
         if not save_path:
             return
 
-        try:
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(self.section_data, f, indent=2)
-            QMessageBox.information(self, "Success", f"Data saved to {save_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save JSON:\n{e}")
+        # Serialize here so the worker writes a consistent snapshot. If nothing
+        # was edited since the last save, the previous bytes are reused.
+        if self.section_data_dirty or self.section_json is None:
+            try:
+                self.section_json = dump_section_json(self.section_data)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save JSON:\n{e}")
+                return
+            self.section_data_dirty = False
+
+        job = BackgroundJob(self, write_bytes_file, save_path, self.section_json)
+        job.signals.finished.connect(self.on_json_saved)
+        job.signals.failed.connect(self.on_json_save_failed)
+        job.start()
+
+    def on_json_saved(self, save_path):
+        QMessageBox.information(self, "Success", f"Data saved to {save_path}")
+
+    def on_json_save_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to save JSON:\n{error}")
 
     # -----------------------------------------
     # Import & Show Model
@@ -932,26 +1427,25 @@ class UCIFileGeneratorApp(QMainWindow):
         """
         Import a Draw.io file and update the tick mark button.
         """
-        file_dialog = QFileDialog(self)
-        drawio_file, _ = file_dialog.getOpenFileName(
-            self, "Select Draw.io XML", "", "XML Files (*.xml);;All Files (*)"
+        drawio_file, _ = QFileDialog.getOpenFileName(
+            self, "Select Draw.io XML", "", "XML Files (*.xml);;All Files (*)",
+            options=FILE_DIALOG_OPTIONS
         )
         if not drawio_file:
             QMessageBox.warning(self, "No File", "No Draw.io file selected.")
             return
 
         try:
-            # Process the file (existing logic)
-            tree = etree.parse(drawio_file)
-            root = tree.getroot()
-            self.shapes_by_id = parse_shapes(root)
-            edges = parse_edges(root)
-            build_graph(self.shapes_by_id, edges)
+            # Reuse the cached result if this exact file was imported before
+            shapes_by_id = load_cached_shapes(drawio_file)
+            if shapes_by_id is None:
+                shapes_by_id, edges = parse_diagram(drawio_file)
+                build_graph(shapes_by_id, edges)
+                save_cached_shapes(drawio_file, shapes_by_id)
+            self.shapes_by_id = shapes_by_id
 
             # Update tickmark button style and tooltip
-            self.drawio_tick_button.setStyleSheet(
-                "background-color: green; color: white; font-weight: bold; border-radius: 15px;"
-            )
+            self.mark_file_loaded(self.drawio_tick_button)
             self.update_file_tooltip(self.drawio_tick_button, drawio_file)
 
             QMessageBox.information(self, "Success", "Draw.io file has been loaded successfully.")
@@ -975,10 +1469,18 @@ class UCIFileGeneratorApp(QMainWindow):
         # Check if there's existing data for this section
         existing_data = self.section_data.get(section_name, {})
 
-        # Create a new SectionWindow
-        window = SectionWindow(section_name, fields, self.pdf_base_url, self, existing_data)
+        # Reuse this section's window if it was opened before
+        window = self.section_windows.get(section_name)
+        if window is None:
+            window = SectionWindow(section_name, fields, self.pdf_base_url, self, existing_data)
+            self.section_windows[section_name] = window
+        else:
+            window.reload(existing_data)
+
         if window.exec():
             # If user clicked Save, store updated data
+            if window.saved_data != existing_data:
+                self.section_data_dirty = True
             self.section_data[section_name] = window.saved_data
 
             # Update color based on final state
@@ -1004,103 +1506,13 @@ class UCIFileGeneratorApp(QMainWindow):
     # Section Callbacks
     # -----------------------------------------
     def global_section(self):
-        fields = {
-            "Model Name": {
-                "placeholder": "Enter a descriptive name for the watershed/model run",
-                "help_text": "This appears under GLOBAL in the UCI.",
-                "pdf_page": 28,
-                "required": True
-            },
-            "Start Date (YYYY/MM/DD)": {
-                "placeholder": "YYYY/MM/DD",
-                "help_text": "Simulation start date.",
-                "pdf_page": 29,
-                "required": True,
-                "is_date": True
-            },
-            "End Date (YYYY/MM/DD)": {
-                "placeholder": "YYYY/MM/DD",
-                "help_text": "Simulation end date.",
-                "pdf_page": 29,
-                "required": True,
-                "is_date": True
-            },
-            "Run/Interp/Output Level": {
-                "placeholder": "RUN INTERP OUTPUT LEVEL    3",
-                "help_text": "Specifies how HSPF will run.",
-                "pdf_page": 30,
-                "required": True
-            },
-            "Resume": {
-                "placeholder": "e.g., 0",
-                "help_text": "'RESUME 0' means do not resume a previous run.",
-                "pdf_page": 30,
-                "required": True
-            },
-            "Run": {
-                "placeholder": "e.g., 1",
-                "help_text": "Sets a run number, e.g. 'RUN 1'.",
-                "pdf_page": 30,
-                "required": True
-            },
-            "Unit System": {
-                "placeholder": "1=English, 2=Metric",
-                "help_text": "Defines unit system: 1=English, 2=Metric.",
-                "pdf_page": 31,
-                "required": True
-            }
-        }
-        self.open_section_window("GLOBAL", fields)
+        self.open_section_window("GLOBAL", GLOBAL_SECTION_FIELDS)
 
     def files_section(self):
         """
         Opens a section window for FILES, allowing the user to specify input and output file names.
         """
-        fields = {
-            "WDM1 (Input File Name)": {
-                "placeholder": "e.g., CONMET.WDM",
-                "help_text": "The primary input file for data.",
-                "pdf_page": 52,
-                "required": True,
-            },
-            "WDM2 (Output File Name)": {
-                "placeholder": "e.g., CONOUT.WDM",
-                "help_text": "The primary output file for data.",
-                "pdf_page": 52,
-                "required": True,
-            },
-            "INFO (Output File Name)": {
-                "placeholder": "e.g., 01_HSPINF.DA",
-                "help_text": "The file for general information output.",
-                "pdf_page": 53,
-                "required": True,
-            },
-            "ERROR (Output File Name)": {
-                "placeholder": "e.g., 01_HSPERR.DA",
-                "help_text": "The file for error message logs.",
-                "pdf_page": 53,
-                "required": True,
-            },
-            "WARN (Output File Name)": {
-                "placeholder": "e.g., 01_HSPWRN.DA",
-                "help_text": "The file for warning message logs.",
-                "pdf_page": 53,
-                "required": True,
-            },
-            "MESSU (Output File Name)": {
-                "placeholder": "e.g., 01_HSPMES.DA",
-                "help_text": "The file for user message logs.",
-                "pdf_page": 53,
-                "required": True,
-            },
-            "Optional Output File": {
-                "placeholder": "e.g., 01_EXTL1.OUT",
-                "help_text": "Any additional output file (optional).",
-                "pdf_page": 53,
-                "required": False,
-            },
-        }
-        self.open_section_window("FILES", fields)
+        self.open_section_window("FILES", FILES_SECTION_FIELDS)
 
     def opn_sequence_section(self):
         """
@@ -1128,32 +1540,26 @@ class UCIFileGeneratorApp(QMainWindow):
             )
             preview_dialog.exec()
         except Exception as e:
-            print(f"Error in opn_sequence_section: {e}")
+            logger.error("Error in opn_sequence_section: %s", e)
             QMessageBox.critical(self, "Error", f"Failed to generate Operation Sequence block:\n{e}")
 
     def perlnd_section(self):
-        fields = {"Pervious Land Parameters": "Specify parameters for pervious land areas"}
-        self.open_section_window("PERLND", fields)
+        self.open_section_window("PERLND", SIMPLE_SECTION_FIELDS["PERLND"])
 
     def implnd_section(self):
-        fields = {"Impervious Land Parameters": "Specify parameters for impervious land areas"}
-        self.open_section_window("IMPLND", fields)
+        self.open_section_window("IMPLND", SIMPLE_SECTION_FIELDS["IMPLND"])
 
     def rchres_section(self):
-        fields = {"Routing Parameters": "Specify parameters for reaches and reservoirs"}
-        self.open_section_window("RCHRES", fields)
+        self.open_section_window("RCHRES", SIMPLE_SECTION_FIELDS["RCHRES"])
 
     def ftables_section(self):
-        fields = {"FTable Parameters": "Specify flow tables for routing"}
-        self.open_section_window("FTABLES", fields)
+        self.open_section_window("FTABLES", SIMPLE_SECTION_FIELDS["FTABLES"])
 
     def ext_sources_section(self):
-        fields = {"External Source Parameters": "Define external input sources"}
-        self.open_section_window("EXT SOURCES", fields)
+        self.open_section_window("EXT SOURCES", SIMPLE_SECTION_FIELDS["EXT SOURCES"])
 
     def ext_targets_section(self):
-        fields = {"External Target Parameters": "Specify targets for external inputs"}
-        self.open_section_window("EXT TARGETS", fields)
+        self.open_section_window("EXT TARGETS", SIMPLE_SECTION_FIELDS["EXT TARGETS"])
 
     def network_section(self):
         """
@@ -1163,15 +1569,26 @@ class UCIFileGeneratorApp(QMainWindow):
             QMessageBox.warning(self, "No Data", "No model data has been imported yet.")
             return
 
+        if self.excel_load_in_progress:
+            # The preview opens once the workbook being read is ready
+            self.show_network_after_excel = True
+            return
+
         if not self.drainage_area_mapping:
             QMessageBox.warning(self, "Excel File Required", "Please load an Excel file to proceed.")
-            self.load_drainage_areas()  # Allow the user to load the file
-            if not self.drainage_area_mapping:
-                return
+            # Allow the user to load the file; the preview opens once it has been read
+            self.show_network_after_excel = True
+            self.load_drainage_areas()
+            return
 
         try:
-            # Generate the NETWORK block
-            network_block = generate_corrected_network_block(self.shapes_by_id, self.drainage_area_mapping)
+            # Generate the NETWORK block, unless the model and mapping are the same
+            # objects it was last built from (both are replaced, never mutated, on reload)
+            inputs = self.network_block_inputs
+            if inputs and inputs[0] is self.shapes_by_id and inputs[1] is self.drainage_area_mapping:
+                network_block = self.network_block
+            else:
+                network_block = generate_corrected_network_block(self.shapes_by_id, self.drainage_area_mapping)
 
             if not network_block:
                 QMessageBox.warning(self, "Error", "Failed to generate network block.")
@@ -1179,6 +1596,7 @@ class UCIFileGeneratorApp(QMainWindow):
 
             # Store the generated NETWORK block for later use
             self.network_block = network_block
+            self.network_block_inputs = (self.shapes_by_id, self.drainage_area_mapping)
 
             # Show the NETWORK block in the preview dialog
             preview_dialog = PreviewDialog(
@@ -1190,67 +1608,109 @@ class UCIFileGeneratorApp(QMainWindow):
             )
             preview_dialog.exec()
         except Exception as e:
-            print(f"Error in network_section: {e}")
+            logger.error("Error in network_section: %s", e)
             QMessageBox.critical(self, "Error", f"Failed to generate NETWORK section:\n{e}")
 
     def load_drainage_areas(self):
         """
         Load drainage areas from the Excel file into a mapping and display confirmation.
+        The workbook is read on a worker thread; an unchanged workbook (same path,
+        mtime and size) is taken from the cache instead of being parsed again.
         """
-        file_dialog = QFileDialog(self)
-        excel_file, _ = file_dialog.getOpenFileName(
-            self, "Select Excel File", "", "Excel Files (*.xlsx);;All Files (*)"
+        if self.excel_load_in_progress:
+            return
+
+        excel_file, _ = QFileDialog.getOpenFileName(
+            self, "Select Excel File", "", "Excel Files (*.xlsx);;All Files (*)",
+            options=FILE_DIALOG_OPTIONS
         )
         if not excel_file:
+            self.show_network_after_excel = False
             QMessageBox.warning(self, "No File", "No Excel file selected.")
-            return {}
+            return
 
         try:
-            df = pd.read_excel(excel_file)
-            drainage_area_mapping = {}
-            for _, row in df.iterrows():
-                subcatchment = int(row["SUBCATCHMENT"])
-                perlnd_area = row["PERLND"]
-                implnd_area = row["IMPLND"]
+            stat = os.stat(excel_file)
+        except OSError as e:
+            self.show_network_after_excel = False
+            QMessageBox.critical(self, "Error", f"Failed to load Excel file:\n{e}")
+            return
+        cache_key = (excel_file, stat.st_mtime_ns, stat.st_size)
 
-                drainage_area_mapping[f"PERLND {subcatchment}.0"] = perlnd_area
-                drainage_area_mapping[f"IMPLND {subcatchment}.0"] = implnd_area
+        cached = self.drainage_area_cache.get(excel_file)
+        if cached is not None and cached[0] == cache_key:
+            self.on_drainage_areas_loaded(excel_file, cache_key, cached[1])
+            return
 
-            # Store the state
-            self.loaded_excel_file = excel_file
-            self.drainage_area_mapping = drainage_area_mapping
+        # Busy until the worker reports back
+        self.excel_load_in_progress = True
+        self.load_excel_button.setEnabled(False)
+        job = BackgroundJob(self, build_drainage_area_mapping, excel_file)
+        job.signals.finished.connect(partial(self.on_drainage_areas_loaded, excel_file, cache_key))
+        job.signals.failed.connect(self.on_drainage_areas_failed)
+        job.start()
+
+    def on_drainage_areas_loaded(self, excel_file, cache_key, drainage_area_mapping):
+        self.excel_load_in_progress = False
+        self.load_excel_button.setEnabled(True)
+        # Replaces any mapping from an older version of the same workbook
+        self.drainage_area_cache[excel_file] = (cache_key, drainage_area_mapping)
+
+        # Store the state
+        self.loaded_excel_file = excel_file
+        self.drainage_area_mapping = drainage_area_mapping
+
+        # Update tickmark button style and tooltip
+        self.mark_file_loaded(self.excel_tick_button)
+        self.update_file_tooltip(self.excel_tick_button, excel_file)
+
+        # Confirmation message
+        QMessageBox.information(self, "Success", "Excel file has been loaded successfully.")
+
+        # Finish a NETWORK request that was waiting for this workbook
+        if self.show_network_after_excel:
+            self.show_network_after_excel = False
+            if drainage_area_mapping:
+                self.network_section()
+            else:
+                QMessageBox.warning(self, "No Drainage Areas", "The Excel file has no drainage areas.")
 
-            # Update tickmark button style and tooltip
-            self.excel_tick_button.setStyleSheet(
-                "background-color: green; color: white; font-weight: bold; border-radius: 15px;"
-            )
-            self.update_file_tooltip(self.excel_tick_button, excel_file)
+    def on_drainage_areas_failed(self, error):
+        self.excel_load_in_progress = False
+        self.load_excel_button.setEnabled(True)
+        self.show_network_after_excel = False
+        QMessageBox.critical(self, "Error", f"Failed to load Excel file:\n{error}")
 
-            # Confirmation message
-            QMessageBox.information(self, "Success", "Excel file has been loaded successfully.")
-            return drainage_area_mapping
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load Excel file:\n{e}")
-            return {}
+    def mark_file_loaded(self, button):
+        """
+        Turn a tick mark button green. The colours live in MAIN_STYLE_SHEET, keyed
+        on the tickState property, so only a re-polish is needed, not a new stylesheet.
+        """
+        button.setProperty("tickState", "loaded")
+        button.style().unpolish(button)
+        button.style().polish(button)
 
     def update_file_tooltip(self, button, file_path):
         """
         Update the tooltip for the tick mark button to show the file name or full path.
         """
-        file_name = file_path.split("/")[-1]  # Extract the file name
+        file_name = os.path.basename(file_path)  # Extract the file name (any separator)
         button.setToolTip(f"File: {file_name}")  # Default to file name
         button.full_path = file_path  # Store the full path in the button
+        button.file_name = file_name  # ...and its file name, so toggles don't recompute it
+        # Clicking is handled by the toggle connected once in create_input_group
 
-        # Attach toggle functionality
-        def toggle_tooltip():
-            current_tooltip = button.toolTip()
-            if "Full Path" in current_tooltip:
-                button.setToolTip(f"File: {file_name}")  # Show file name
-            else:
-                button.setToolTip(f"Full Path: {file_path}")  # Show full path
-
-        button.clicked.disconnect()  # Ensure no duplicate connections
-        button.clicked.connect(toggle_tooltip)
+    def toggle_file_tooltip(self, button):
+        """
+        Toggles a tick mark button's tooltip between the file name and full path.
+        Does nothing until a file has been loaded for that button.
+        """
+        if not hasattr(button, "full_path"):
+            return
+        if "Full Path" in button.toolTip():
+            button.setToolTip(f"File: {button.file_name}")  # Show file name
+        else:
+            button.setToolTip(f"Full Path: {button.full_path}")  # Show full path
 
     def toggle_full_path(self, event):
         """
@@ -1274,46 +1734,43 @@ class UCIFileGeneratorApp(QMainWindow):
         """
         Toggles the tooltip between the file name and full file path for the tick mark button.
         """
-        if self.is_showing_full_path:
-            # Switch to file name
-            self.excel_tick_button.setToolTip(f"File: {self.selected_file_name}")
-            self.is_showing_full_path = False
-        else:
-            # Switch to full path
-            self.excel_tick_button.setToolTip(f"Full Path: {self.selected_full_path}")
-            self.is_showing_full_path = True
+        self.toggle_file_tooltip(self.excel_tick_button)
 
     def toggle_drawio_tooltip(self):
         """
         Toggles the tooltip between the file name and full file path for the Draw.io tick mark button.
         """
-        if hasattr(self.drawio_tick_button, "full_path"):
-            current_tooltip = self.drawio_tick_button.toolTip()
-            if "Full Path" in current_tooltip:
-                # Switch to file name
-                file_name = self.drawio_tick_button.full_path.split("/")[-1]
-                self.drawio_tick_button.setToolTip(f"File: {file_name}")
-            else:
-                # Switch to full path
-                self.drawio_tick_button.setToolTip(f"Full Path: {self.drawio_tick_button.full_path}")
+        self.toggle_file_tooltip(self.drawio_tick_button)
 
     def toggle_json_tooltip(self):
         """
         Toggles the tooltip between the file name and full file path for the JSON tick mark button.
         """
-        if hasattr(self.json_tick_button, "full_path"):
-            current_tooltip = self.json_tick_button.toolTip()
-            if "Full Path" in current_tooltip:
-                # Switch to file name
-                file_name = self.json_tick_button.full_path.split("/")[-1]
-                self.json_tick_button.setToolTip(f"File: {file_name}")
-            else:
-                # Switch to full path
-                self.json_tick_button.setToolTip(f"Full Path: {self.json_tick_button.full_path}")
+        self.toggle_file_tooltip(self.json_tick_button)
 
 # -------------------------------------------------------
 # Generate text for GLOBAL (you could add others similarly)
 # -------------------------------------------------------
+# GLOBAL block layout; "combined" is the RESUME/RUN pair, padded to 32 columns
+GLOBAL_SECTION_TEMPLATE = (
+    "GLOBAL\n"
+    "  {model}\n"
+    "  START       {start:<16}  END    {end}\n"
+    "  RUN INTERP OUTPUT LEVEL    {run_interp}\n"
+    "  {combined:<32}         UNIT SYSTEM     {unit}\n"
+    "END GLOBAL"
+)
+
+# FILES block rows: (file type, unit number, section_data key)
+FILES_SECTION_ENTRIES = (
+    ("WDM1", 23, "WDM1 (Input File Name)"),
+    ("WDM2", 21, "WDM2 (Output File Name)"),
+    ("INFO", 24, "INFO (Output File Name)"),
+    ("ERROR", 25, "ERROR (Output File Name)"),
+    ("WARN", 26, "WARN (Output File Name)"),
+    ("MESSU", 27, "MESSU (Output File Name)"),
+)
+
 def generate_global_section_text(data_dict):
     """
     data_dict might look like:
@@ -1327,26 +1784,16 @@ def generate_global_section_text(data_dict):
       "Unit System": "2"
     }
     """
-    lines = []
-    lines.append("GLOBAL")
-    lines.append(f"  {data_dict.get('Model Name', '').strip()}")
-
-    start_d = data_dict.get("Start Date (YYYY/MM/DD)", "")
-    end_d   = data_dict.get("End Date (YYYY/MM/DD)", "")
-    lines.append(f"  START       {start_d:<16}  END    {end_d}")
-
-    run_interp = data_dict.get("Run/Interp/Output Level", "RUN INTERP OUTPUT LEVEL    3")
-    lines.append(f"  RUN INTERP OUTPUT LEVEL    {run_interp}")
-
-    resume_val = data_dict.get("Resume", "0")
-    run_val    = data_dict.get("Run", "1")
-    combined   = f"RESUME     {resume_val} RUN     {run_val}"
-    combined   = f"{combined:<32}"  # left-justify
-    unit_sys   = data_dict.get("Unit System", "2")
-    lines.append(f"  {combined}         UNIT SYSTEM     {unit_sys}")
-
-    lines.append("END GLOBAL")
-    return "\n".join(lines)
+    g = data_dict.get
+    combined = f"RESUME     {g('Resume', '0')} RUN     {g('Run', '1')}"
+    return GLOBAL_SECTION_TEMPLATE.format(
+        model=g("Model Name", "").strip(),
+        start=g("Start Date (YYYY/MM/DD)", ""),
+        end=g("End Date (YYYY/MM/DD)", ""),
+        run_interp=g("Run/Interp/Output Level", "RUN INTERP OUTPUT LEVEL    3"),
+        combined=combined,
+        unit=g("Unit System", "2"),
+    )
 
 def generate_files_section_text(data_dict):
     """
@@ -1357,194 +1804,286 @@ def generate_files_section_text(data_dict):
     lines.append("<ftyp>  <un#>   <-------file name ------------------------------------->****")
 
     # Add required file entries
-    file_entries = [
-        ("WDM1", 23, data_dict.get("WDM1 (Input File Name)", "").strip()),
-        ("WDM2", 21, data_dict.get("WDM2 (Output File Name)", "").strip()),
-        ("INFO", 24, data_dict.get("INFO (Output File Name)", "").strip()),
-        ("ERROR", 25, data_dict.get("ERROR (Output File Name)", "").strip()),
-        ("WARN", 26, data_dict.get("WARN (Output File Name)", "").strip()),
-        ("MESSU", 27, data_dict.get("MESSU (Output File Name)", "").strip()),
-    ]
-
-    for ftyp, un, fname in file_entries:
+    g = data_dict.get
+    for ftyp, un, key in FILES_SECTION_ENTRIES:
+        fname = g(key, "").strip()
         if fname:
             lines.append(f"{ftyp:<10}{un:<6}{fname}")
 
     # Add optional file entry if provided
-    optional_file = data_dict.get("Optional Output File", "").strip()
+    optional_file = g("Optional Output File", "").strip()
     if optional_file:
         lines.append(f"{'':<10}{50:<6}{optional_file}")
 
     lines.append("END FILES")
     return "\n".join(lines)
 
-def generate_corrected_network_block(shapes_by_id, drainage_area_mapping):
+def read_drainage_sheet(excel_file):
     """
-    Generate the NETWORK block with corrected drainage areas and relationships,
-    grouped and ordered as required.
+    Read only the drainage-area columns, with pinned dtypes. Uses the Rust-based
+    calamine engine when python-calamine is installed, else openpyxl (which pandas
+    already opens read-only).
+    """
+    import pandas as pd  # Deferred: only needed once an Excel file is loaded
+
+    try:
+        import python_calamine  # noqa: F401
+        engine = "calamine"
+    except ImportError:
+        engine = "openpyxl"
+
+    return pd.read_excel(
+        excel_file,
+        engine=engine,
+        usecols=list(DRAINAGE_COLUMN_DTYPES),
+        dtype=DRAINAGE_COLUMN_DTYPES,
+    )
+
+def build_drainage_area_mapping(excel_file):
+    """
+    Read the drainage sheet and map subcatchment number -> (PERLND area, IMPLND area),
+    with the areas already scaled and rounded the way NETWORK lines print them.
+    """
+    df = read_drainage_sheet(excel_file)
+
+    # Built column-wise instead of row by row; scaling happens once per workbook
+    perlnd_areas = (df["PERLND"].to_numpy() / DRAINAGE_AREA_SCALE).round(7).tolist()
+    implnd_areas = (df["IMPLND"].to_numpy() / DRAINAGE_AREA_SCALE).round(7).tolist()
+    return dict(zip(
+        df["SUBCATCHMENT"].astype(int).tolist(),
+        zip(perlnd_areas, implnd_areas)
+    ))
+
+def generate_corrected_network_block_iter(shapes_by_id, drainage_area_mapping):
     """
-    network_lines = []
+    Yield the NETWORK block lines with corrected drainage areas and relationships,
+    grouped and ordered as required, with a blank line between groups.
+    """
+    # Without drainage areas or routing shapes there is nothing to emit
+    if not drainage_area_mapping and not any(
+        sd.hydro_type in ROUTING_HYDRO_TYPES for sd in shapes_by_id.values()
+    ):
+        return
+
     rchres_groups = {}
+    downstream = {}  # RCHRES group label -> labels its RCHRES lines discharge to
+
+    # Flat lookups, built once; each step only sorts the shapes it handles
+    id_to_label = {sid: shape_data.label for sid, shape_data in shapes_by_id.items()}
+    subcatchments = sorted(
+        (sd for sd in shapes_by_id.values() if sd.hydro_type == "Subcatchment"),
+        key=lambda sd: sd.label
+    )
+    routing_shapes = sorted(
+        (sd for sd in shapes_by_id.values() if sd.hydro_type in ROUTING_HYDRO_TYPES),
+        key=lambda sd: sd.label
+    )
 
     # Step 1: Process Subcatchments (PERLND, IMPLND) and group by their target RCHRES
-    for shape_id, shape_data in sorted(shapes_by_id.items(), key=lambda x: x[1]["label"]):
-        label = shape_data["label"]
-        hydro_type = shape_data["hydro_type"]
-        outgoing = shape_data["outgoing"]
-
-        if hydro_type == "Subcatchment":
-            perlnd_key = f"PERLND {label}.0"
-            implnd_key = f"IMPLND {label}.0"
-
-            # Validate outgoing connections
-            if not outgoing or outgoing[0]["target"] not in shapes_by_id:
-                print(f"Warning: Invalid or missing target for Subcatchment {label}")
-                continue
+    for shape_data in subcatchments:
+        label = shape_data.label
+        outgoing = shape_data.outgoing
+
+        # Validate outgoing connections
+        target_label = id_to_label.get(outgoing[0].target) if outgoing else None
+        if target_label is None:
+            logger.warning("Invalid or missing target for Subcatchment %s", label)
+            continue
 
-            target_id = outgoing[0]["target"]
-            target_label = shapes_by_id[target_id]["label"]
+        if target_label not in rchres_groups:
+            rchres_groups[target_label] = []
 
-            if target_label not in rchres_groups:
-                rchres_groups[target_label] = []
+        # Drainage areas are keyed by subcatchment number
+        try:
+            areas = drainage_area_mapping.get(int(label))
+        except ValueError:
+            areas = None
+        if areas is None:
+            continue
+        perlnd_area, implnd_area = areas
+        label_pad = f"{label:<3}"
+        target_pad = f"{target_label:<3}"
 
-            # Add PERLND connection
-            if perlnd_key in drainage_area_mapping:
-                drainage_area = round(drainage_area_mapping[perlnd_key] / 100000, 7)
-                rchres_groups[target_label].append(
-                    f"PERLND {label:<3} PWATER PERO      {drainage_area:<9.7f}      RCHRES {target_label:<3}     INFLOW"
-                )
-                print(f"Added PERLND Connection: {label} -> {target_label}")
+        # Add PERLND connection
+        rchres_groups[target_label].append(
+            PERLND_NETWORK_FMT.format(label_pad, perlnd_area, target_pad)
+        )
+        logger.debug("Added PERLND Connection: %s -> %s", label, target_label)
 
-            # Add IMPLND connection
-            if implnd_key in drainage_area_mapping:
-                drainage_area = round(drainage_area_mapping[implnd_key] / 100000, 7)
-                rchres_groups[target_label].append(
-                    f"IMPLND {label:<3} IWATER SURO      {drainage_area:<9.7f}      RCHRES {target_label:<3}     INFLOW"
-                )
-                print(f"Added IMPLND Connection: {label} -> {target_label}")
+        # Add IMPLND connection
+        rchres_groups[target_label].append(
+            IMPLND_NETWORK_FMT.format(label_pad, implnd_area, target_pad)
+        )
+        logger.debug("Added IMPLND Connection: %s -> %s", label, target_label)
 
     # Step 2: Process RCHRES relationships
-    for shape_id, shape_data in sorted(shapes_by_id.items(), key=lambda x: x[1]["label"]):
-        if shape_data["hydro_type"] in ["RCHRES", "Node", "SWM Facility"]:
-            label = shape_data["label"]
-
-            for connection in shape_data["outgoing"]:
-                target_id = connection["target"]
-                if target_id not in shapes_by_id:
-                    print(f"Warning: Invalid or missing target ID {target_id} for RCHRES {label}")
-                    continue
-
-                target_label = shapes_by_id[target_id]["label"]
-                if label not in rchres_groups:
-                    rchres_groups[label] = []
-                rchres_groups[label].append(
-                    f"RCHRES {label:<3} HYDR   ROVOL                    RCHRES {target_label:<3}     INFLOW"
-                )
-                print(f"Added RCHRES Connection: {label} -> {target_label}")
+    for shape_data in routing_shapes:
+        label = shape_data.label
+        label_pad = f"{label:<3}"
+
+        for connection in shape_data.outgoing:
+            target_id = connection.target
+            target_label = id_to_label.get(target_id)
+            if target_label is None:
+                logger.warning("Invalid or missing target ID %s for RCHRES %s", target_id, label)
+                continue
+
+            if label not in rchres_groups:
+                rchres_groups[label] = []
+            rchres_groups[label].append(
+                RCHRES_NETWORK_FMT.format(label_pad, f"{target_label:<3}")
+            )
+            downstream.setdefault(label, []).append(target_label)
+            logger.debug("Added RCHRES Connection: %s -> %s", label, target_label)
 
     # Step 3: Order and Format the Output
+    # Depth-first from each group in turn, so a group is followed by the groups
+    # its reaches discharge into. Children are pushed in reverse so they're
+    # visited in line order; the processed check happens on pop, as a recursive
+    # walk would do it.
     processed_rchres = set()
-
-    def process_rchres(label):
+    first_group = True
+    stack = list(reversed(rchres_groups))
+    while stack:
+        label = stack.pop()
         if label in processed_rchres:
-            print(f"Skipping already processed RCHRES: {label}")
-            return
-
-        # Debug: Starting processing
-        print(f"Processing RCHRES Group: {label}")
-
-        # Add the group for this RCHRES
-        if label in rchres_groups and rchres_groups[label]:
-            network_lines.extend(rchres_groups[label])
-            network_lines.append("")  # Add a blank line between groups
-
+            logger.debug("Skipping already processed RCHRES: %s", label)
+            continue
         processed_rchres.add(label)
+        logger.debug("Processing RCHRES Group: %s", label)
 
-        # Process downstream connections
-        for line in rchres_groups.get(label, []):
-            if "RCHRES" in line:
-                target_label = line.split()[-2]
-                if target_label in rchres_groups:
-                    process_rchres(target_label)
-                else:
-                    print(f"Warning: Target label {target_label} not found in RCHRES groups.")
+        # Yield the group for this RCHRES, separating groups with a blank line
+        group = rchres_groups[label]
+        if group:
+            if not first_group:
+                yield ""
+            first_group = False
+            yield from group
 
-    # Start with all RCHRES groups
-    for label in rchres_groups:
-        process_rchres(label)
+        # Process downstream connections
+        for target_label in reversed(downstream.get(label, ())):
+            if target_label in rchres_groups:
+                stack.append(target_label)
+            else:
+                logger.debug("Target label %s not found in RCHRES groups.", target_label)
 
-    # Final clean-up: Remove trailing blank line
-    if network_lines and network_lines[-1] == "":
-        network_lines.pop()
+def generate_corrected_network_block(shapes_by_id, drainage_area_mapping):
+    """
+    Generate the NETWORK block with corrected drainage areas and relationships,
+    grouped and ordered as required.
+    """
+    network_lines = list(generate_corrected_network_block_iter(shapes_by_id, drainage_area_mapping))
 
     # Debug final output
     if not network_lines:
-        print("Error: No valid network lines generated.")
+        logger.error("No valid network lines generated.")
         return None
 
-    print(f"Generated Network Block: \n{network_lines}")
+    logger.info("Generated NETWORK block: %d lines", len(network_lines))
     return network_lines
 
-def generate_operation_sequence_block(network_block):
+@lru_cache(maxsize=8192)
+def parse_network_line(line):
+    """
+    Split a non-blank NETWORK line into (operation, ID, referenced RCHRES ID or
+    None), or None if it has fewer than two tokens. Cached, since regenerating
+    the sequence re-reads the same lines.
     """
-    Generate the Operation Sequence Block from the given NETWORK block.
+    # Only the first two tokens are needed for every line
+    parts = line.split(None, 2)
+    if len(parts) < 2:
+        return None
+
+    # RCHRES lines with 8+ tokens (6+ after the operation and ID) reference a
+    # target RCHRES as their second to last token
+    target_id = None
+    if parts[0] == "RCHRES" and len(parts) == 3:
+        tail = parts[2].rsplit(None, 5)
+        if len(tail) == 6:
+            target_id = tail[-2]
+    return parts[0], parts[1], target_id
+
+def rchres_id_sort_key(rchres_id):
+    """
+    Order RCHRES IDs numerically ("2" before "10"), with any non-numeric IDs
+    after them in text order. IDs are kept as text so they print as written.
+    """
+    if rchres_id.isdigit():
+        return (0, int(rchres_id), rchres_id)
+    return (1, 0, rchres_id)
+
+def generate_operation_sequence_iter(network_block):
+    """
+    Yield the Operation Sequence Block lines from the given NETWORK block.
     Ensures all RCHRES targets are included, even if only referenced downstream,
     while preserving grouping and sequence order.
     """
-    operation_sequence = []
-    processed_operations = set()  # To track operations already added
-    referenced_rchres_targets = set()  # To track all RCHRES targets explicitly referenced
+    processed_operations = set()  # (operation, ID) pairs already added
+    processed_rchres_ids = set()  # IDs of RCHRES operations already added
+    referenced_rchres_ids = set()  # IDs of all RCHRES targets explicitly referenced
 
-    current_group = []  # Temporary storage for operations within the current group
+    group_nonempty = False  # Whether the current group has yielded an operation
+    pending_blank = False  # Blank separator owed before the next operation
 
-    def flush_group():
-        """Flush the current group to the operation sequence and clear it."""
-        if current_group:
-            operation_sequence.extend(current_group)
-            operation_sequence.append("")  # Add a blank line to separate groups
-            current_group.clear()
+    # Bound once; these run for every line (the sets themselves are already locals)
+    parse_line = parse_network_line
+    add_processed = processed_operations.add
+    add_rchres = processed_rchres_ids.add
+    add_referenced = referenced_rchres_ids.add
 
     for line in network_block:
         if not line.strip():  # Blank line indicates group separation
-            flush_group()
+            if group_nonempty:
+                pending_blank = True
+                group_nonempty = False
             continue
 
-        parts = line.split()
-        if len(parts) < 2:  # Skip invalid lines
+        parsed = parse_line(line)
+        if parsed is None:  # Skip invalid lines
             continue
 
-        # Extract the operation and its ID
-        operation = f"{parts[0]} {parts[1]}"
-        if operation not in processed_operations:
-            processed_operations.add(operation)
-            current_group.append(operation)
+        # The display string is only built once per operation
+        head, op_id, target_id = parsed
+        key = (head, op_id)
+        if key not in processed_operations:
+            add_processed(key)
+            if head == "RCHRES":
+                add_rchres(op_id)
+            if pending_blank:
+                yield ""
+                pending_blank = False
+            yield f"{head} {op_id}"
+            group_nonempty = True
 
         # Track RCHRES targets explicitly referenced in the line
-        if parts[0] == "RCHRES" and len(parts) >= 8:
-            target_rchres = f"RCHRES {parts[-2]}"
-            referenced_rchres_targets.add(target_rchres)
-
-    # Flush the last group
-    flush_group()
-
-    # Add any unprocessed RCHRES targets to the sequence
-    unprocessed_targets = referenced_rchres_targets - processed_operations
-    if unprocessed_targets:
-        operation_sequence.append("")  # Separate dangling targets into a new group
-        for target in sorted(unprocessed_targets):
-            operation_sequence.append(target)
-            print(f"Added missing RCHRES target to operation sequence: {target}")
-
-    # Remove trailing blank lines
-    while operation_sequence and operation_sequence[-1] == "":
-        operation_sequence.pop()
+        if target_id is not None:
+            add_referenced(target_id)
+
+    # Add any unprocessed RCHRES targets as a separate trailing group
+    unprocessed_ids = referenced_rchres_ids - processed_rchres_ids
+    if unprocessed_ids:
+        if pending_blank or group_nonempty:
+            yield ""  # Close the last group
+        yield ""  # Separate dangling targets into a new group
+        missing_ids = sorted(unprocessed_ids, key=rchres_id_sort_key)
+        logger.debug(
+            "Added %d missing RCHRES targets to operation sequence: %s",
+            len(missing_ids), missing_ids
+        )
+        for rchres_id in missing_ids:
+            yield f"RCHRES {rchres_id}"
 
-    return operation_sequence
+def generate_operation_sequence_block(network_block):
+    """
+    Generate the Operation Sequence Block from the given NETWORK block as a list.
+    """
+    return list(generate_operation_sequence_iter(network_block))
 
 # -------------------------------------------------------
 # Main Entry Point
 # -------------------------------------------------------
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
     app = QApplication(sys.argv)
     window = UCIFileGeneratorApp()
     window.show()